@@ -1,15 +1,30 @@
 
-from typing import Optional, Dict
-from enum import Enum
+from typing import Optional, Dict, List, Union
+from enum import IntEnum
+from operator import attrgetter
 import logging
+import sys
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; NumPy reductions are used instead
+    njit = None
 
 logger = logging.getLogger(__name__)
 
 
-class PaymentStatus(str, Enum):
-    SUCCESS = "success"
-    FAILURE = "failure"
-    PENDING = "pending"
+class PaymentStatus(IntEnum):
+    PENDING = 0
+    SUCCESS = 1
+    FAILURE = 2
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    # Low-cardinality labels repeat across every signal; interning lets
+    # equality checks and dict lookups short-circuit on identity.
+    return sys.intern(value) if value is not None else None
 
 
 class PaymentSignal:
@@ -17,14 +32,30 @@ class PaymentSignal:
     Tolerant signal model.
     ALL non-core fields optional.
     Safe for UI + simulator.
+    Unknown keyword fields are kept in `extra`.
     """
 
+    __slots__ = (
+        "transaction_id",
+        "amount",
+        "currency",
+        "status",
+        "latency_ms",
+        "error_code",
+        "timestamp",
+        "payment_method",
+        "processor",
+        "issuer_bank",
+        "batch_id",
+        "extra",
+    )
+
     def __init__(
         self,
         transaction_id: str,
         amount: float = 0.0,
         currency: str = "USD",
-        status: str = PaymentStatus.SUCCESS,
+        status: Union[str, int, PaymentStatus] = PaymentStatus.SUCCESS,
         latency_ms: float = 0.0,
         error_code: Optional[str] = None,
         timestamp: float = 0.0,
@@ -36,13 +67,48 @@ class PaymentSignal:
         self.transaction_id = transaction_id
         self.amount = amount
         self.currency = currency
-        self.status = str(status)
+        if isinstance(status, str):
+            status = PaymentStatus.__members__.get(status.upper(), PaymentStatus.PENDING)
+        self.status = PaymentStatus(status)
         self.latency_ms = latency_ms
         self.error_code = error_code
         self.timestamp = timestamp
-        self.payment_method = payment_method
-        self.processor = processor
-        self.issuer_bank = issuer_bank
+        self.payment_method = _intern(payment_method)
+        self.processor = _intern(processor)
+        self.issuer_bank = _intern(issuer_bank)
+        self.batch_id = 0
+        self.extra = kwargs or None
+
+
+_SUCCESS = int(PaymentStatus.SUCCESS)
+_FAILURE = int(PaymentStatus.FAILURE)
+
+
+if njit is not None:
+    @njit(fastmath=True, cache=True)
+    def _reduce_metrics(status, latency):
+        """Single fused pass: (success count, failure count, latency sum)."""
+        succ = 0
+        fail = 0
+        lat_sum = 0.0
+        for i in range(status.shape[0]):
+            code = status[i]
+            if code == _SUCCESS:
+                succ += 1
+            elif code == _FAILURE:
+                fail += 1
+            lat_sum += latency[i]
+        return succ, fail, lat_sum
+
+    # Compile up front so the first batch doesn't pay for it
+    _reduce_metrics(np.zeros(1, dtype=np.uint8), np.zeros(1, dtype=np.float64))
+else:
+    def _reduce_metrics(status, latency):
+        return (
+            np.count_nonzero(status == _SUCCESS),
+            np.count_nonzero(status == _FAILURE),
+            latency.sum(),
+        )
 
 
 class AgentMemory:
@@ -55,15 +121,54 @@ class PaymentObserver:
         self.memory = memory
         self.signals = []
 
+        # Running aggregates so metric queries are O(1) in history size.
+        self._n = 0
+        self._succ = 0
+        self._fail = 0
+        self._lat_sum = 0.0
+
+        # Last metrics snapshot, reused until a new signal is observed.
+        self._last_n = -1
+        self._last_metrics = None
+
     async def observe(self, signal: PaymentSignal):
+        code = signal.status
+        self._n += 1
+
+        if code == PaymentStatus.SUCCESS:
+            self._succ += 1
+        elif code == PaymentStatus.FAILURE:
+            self._fail += 1
+        self._lat_sum += signal.latency_ms
+
         self.signals.append(signal)
         self.memory.recent_signals.append(signal)
 
+    async def observe_batch(self, signals: List[PaymentSignal]):
+        count = len(signals)
+        status = np.fromiter(
+            map(attrgetter("status"), signals), dtype=np.uint8, count=count
+        )
+        latency = np.fromiter(
+            map(attrgetter("latency_ms"), signals), dtype=np.float64, count=count
+        )
+        self._n += count
+
+        succ, fail, lat_sum = _reduce_metrics(status, latency)
+        self._succ += int(succ)
+        self._fail += int(fail)
+        self._lat_sum += float(lat_sum)
+
+        self.signals.extend(signals)
+        self.memory.recent_signals.extend(signals)
+
     def calculate_metrics(self) -> Dict:
-        total = len(self.signals)
+        total = self._n
+        if total == self._last_n:
+            return dict(self._last_metrics)  # copy, so callers can't mutate the cache
 
         if total == 0:
-            return {
+            metrics = {
                 "total_volume": 0,
                 "success_count": 0,
                 "failure_count": 0,
@@ -72,19 +177,23 @@ class PaymentObserver:
                 "avg_latency": 0.0,
                 "retry_rate": 0.0,
             }
+        else:
+            success = self._succ
+            failure = self._fail
+
+            metrics = {
+                "total_volume": total,
+                "success_count": success,
+                "failure_count": failure,
+                "success_rate": success / total,
+                "failure_rate": failure / total,
+                "avg_latency": self._lat_sum / total,
+                "retry_rate": 0.0,
+            }
 
-        success = sum(1 for s in self.signals if s.status == "success")
-        failure = sum(1 for s in self.signals if s.status == "failure")
-
-        return {
-            "total_volume": total,
-            "success_count": success,
-            "failure_count": failure,
-            "success_rate": success / total,
-            "failure_rate": failure / total,
-            "avg_latency": sum(s.latency_ms for s in self.signals) / total,
-            "retry_rate": 0.0,
-        }
+        self._last_n = total
+        self._last_metrics = metrics
+        return dict(metrics)
 
 
 class PaymentOpsAgent:
@@ -96,6 +205,9 @@ class PaymentOpsAgent:
     async def process_payment_signal(self, signal: PaymentSignal):
         await self.observer.observe(signal)
 
+    async def process_batch(self, signals: List[PaymentSignal]):
+        await self.observer.observe_batch(signals)
+
     def start(self):
         self.running = True
 
@@ -2,11 +2,11 @@ import streamlit as st
 import pandas as pd
 import asyncio
 import time
-import random
 import numpy as np
 import altair as alt
+from pandas.api.types import union_categoricals
 
-from core.agent import PaymentOpsAgent, PaymentSignal
+from core.agent import PaymentOpsAgent, PaymentSignal, PaymentStatus
 
 # ==================================================
 # PAGE SETUP
@@ -14,17 +14,70 @@ from core.agent import PaymentOpsAgent, PaymentSignal
 st.set_page_config(layout="wide")
 st.title("💳 Payment Operations Agent")
 
-agent = PaymentOpsAgent()
+# ==================================================
+# DATAFRAME HELPERS
+# ==================================================
+# Right-closed bucket edges, matching pd.cut(bins=[0, 50, 100, 200, 500, inf])
+AMOUNT_BINS = np.array([50, 100, 200, 500])
+AMOUNT_LABELS = ["0–50", "50–100", "100–200", "200–500", "500+"]
+
+# Fixed vocabularies, so per-batch categoricals concat without widening
+STATUSES = [status.name.lower() for status in PaymentStatus]  # indexed by code
+ISSUERS = ["HDFC", "CITI", "CHASE", "HSBC"]
+PROCESSORS = ["VISA", "MASTERCARD", "AMEX"]
+PAYMENT_METHODS = ["CARD", "UPI", "NETBANKING"]
+
+
+def build_df(signals):
+    df = pd.DataFrame({
+        "Status": pd.Categorical.from_codes(
+            np.fromiter((s.status for s in signals), dtype=np.int8, count=len(signals)),
+            categories=STATUSES,
+        ),
+        "Issuer": pd.Categorical([s.issuer_bank for s in signals], categories=ISSUERS),
+        "Processor": pd.Categorical([s.processor for s in signals], categories=PROCESSORS),
+        "Payment Method": pd.Categorical(
+            [s.payment_method for s in signals], categories=PAYMENT_METHODS
+        ),
+        "Latency": [s.latency_ms for s in signals],
+        "Amount": [s.amount for s in signals],
+        "Timestamp": pd.to_datetime([s.timestamp for s in signals], unit="s"),
+        "Batch": pd.Categorical([s.batch_id for s in signals]),
+    })
+
+    idx = np.searchsorted(AMOUNT_BINS, df["Amount"].to_numpy(), side="left")
+    df["Amount Bucket"] = pd.Categorical.from_codes(
+        idx, categories=AMOUNT_LABELS, ordered=True
+    )
+    return df
+
+
+def append_df(df, new_df):
+    # Batch categories grow with every batch, so merge them explicitly
+    batches = union_categoricals([df["Batch"], new_df["Batch"]], sort_categories=True)
+    df = pd.concat([df, new_df], ignore_index=True)
+    df["Batch"] = batches
+    return df
+
 
 # ==================================================
 # SESSION STATE
 # ==================================================
+# The agent lives in session state so its observer keeps accumulating
+# across reruns instead of being rebuilt on every widget event
+if "agent" not in st.session_state:
+    st.session_state.agent = PaymentOpsAgent()
+
 if "signals" not in st.session_state:
     st.session_state.signals = []
 
 if "batch_id" not in st.session_state:
     st.session_state.batch_id = 1
 
+# Rows are appended per batch so reruns don't rebuild the whole frame
+if "df" not in st.session_state:
+    st.session_state.df = None
+
 # ==================================================
 # SIDEBAR – INPUTS
 # ==================================================
@@ -41,9 +94,9 @@ if not valid:
 avg_latency = st.sidebar.slider("Average Latency (ms)", 50, 3000, 300)
 p95_latency = st.sidebar.slider("P95 Latency (ms)", 50, 3000, 600)
 
-issuer = st.sidebar.selectbox("Issuer", ["HDFC", "CITI", "CHASE", "HSBC"])
-processor = st.sidebar.selectbox("Processor", ["VISA", "MASTERCARD", "AMEX"])
-payment_method = st.sidebar.selectbox("Payment Method", ["CARD", "UPI", "NETBANKING"])
+issuer = st.sidebar.selectbox("Issuer", ISSUERS)
+processor = st.sidebar.selectbox("Processor", PROCESSORS)
+payment_method = st.sidebar.selectbox("Payment Method", PAYMENT_METHODS)
 
 amount = st.sidebar.number_input("Avg Transaction Value ($)", min_value=1.0, value=100.0)
 
@@ -54,10 +107,14 @@ clear_log = st.sidebar.button("🧹 Clear Log")
 # CLEAR LOG
 # ==================================================
 if clear_log:
+    st.session_state.agent = PaymentOpsAgent()
     st.session_state.signals.clear()
+    st.session_state.df = None
     st.session_state.batch_id = 1
     st.success("🧹 Log cleared")
 
+agent = st.session_state.agent
+
 # ==================================================
 # ADD TRANSACTIONS (NEW BATCH)
 # ==================================================
@@ -65,36 +122,59 @@ if add_tx and valid:
     now = time.time()
     batch = st.session_state.batch_id
 
-    for _ in range(success_tx):
-        sig = PaymentSignal(
-            transaction_id=f"S-{len(st.session_state.signals)}",
-            amount=random.uniform(amount * 0.7, amount * 1.3),
-            status="success",
+    rng = np.random.default_rng()
+    offset = len(st.session_state.signals)
+
+    amts = rng.uniform(amount * 0.7, amount * 1.3, success_tx)
+    lats = rng.uniform(avg_latency * 0.7, avg_latency * 1.1, success_tx)
+    tss = now - rng.uniform(0, 600, success_tx)  # IMPORTANT FIX
+
+    success_signals = [
+        PaymentSignal(
+            transaction_id=f"S-{offset + i}",
+            amount=amt,
+            status=PaymentStatus.SUCCESS,
             issuer_bank=issuer,
             processor=processor,
             payment_method=payment_method,
-            latency_ms=random.uniform(avg_latency * 0.7, avg_latency * 1.1),
-            timestamp=now - random.uniform(0, 600),  # IMPORTANT FIX
+            latency_ms=lat,
+            timestamp=ts,
         )
-        sig.batch_id = batch
-        asyncio.run(agent.process_payment_signal(sig))
-        st.session_state.signals.append(sig)
-
-    for _ in range(failed_tx):
-        sig = PaymentSignal(
-            transaction_id=f"F-{len(st.session_state.signals)}",
-            amount=random.uniform(amount * 0.7, amount * 1.3),
-            status="failure",
+        for i, (amt, lat, ts) in enumerate(zip(amts.tolist(), lats.tolist(), tss.tolist()))
+    ]
+    offset += success_tx
+
+    amts = rng.uniform(amount * 0.7, amount * 1.3, failed_tx)
+    lats = rng.uniform(p95_latency * 0.9, p95_latency * 1.3, failed_tx)
+    tss = now - rng.uniform(0, 600, failed_tx)  # IMPORTANT FIX
+
+    failure_signals = [
+        PaymentSignal(
+            transaction_id=f"F-{offset + i}",
+            amount=amt,
+            status=PaymentStatus.FAILURE,
             issuer_bank=issuer,
             processor=processor,
             payment_method=payment_method,
-            latency_ms=random.uniform(p95_latency * 0.9, p95_latency * 1.3),
+            latency_ms=lat,
             error_code="TIMEOUT",
-            timestamp=now - random.uniform(0, 600),  # IMPORTANT FIX
+            timestamp=ts,
         )
+        for i, (amt, lat, ts) in enumerate(zip(amts.tolist(), lats.tolist(), tss.tolist()))
+    ]
+
+    new_signals = success_signals + failure_signals
+    for sig in new_signals:
         sig.batch_id = batch
-        asyncio.run(agent.process_payment_signal(sig))
-        st.session_state.signals.append(sig)
+
+    asyncio.run(agent.process_batch(new_signals))
+    st.session_state.signals.extend(new_signals)
+
+    new_df = build_df(new_signals)
+    if st.session_state.df is None:
+        st.session_state.df = new_df
+    else:
+        st.session_state.df = append_df(st.session_state.df, new_df)
 
     st.session_state.batch_id += 1
     st.success(f"✅ Batch {batch} added")
@@ -106,35 +186,42 @@ if not st.session_state.signals:
     st.info("No transactions yet.")
     st.stop()
 
-df = pd.DataFrame([{
-    "Status": s.status,
-    "Issuer": s.issuer_bank,
-    "Processor": s.processor,
-    "Payment Method": s.payment_method,
-    "Latency": s.latency_ms,
-    "Amount": s.amount,
-    "Timestamp": pd.to_datetime(s.timestamp, unit="s"),
-    "Batch": getattr(s, "batch_id", 0),
-} for s in st.session_state.signals])
+df = st.session_state.df
 
 # ==================================================
 # METRICS
 # ==================================================
+metrics = agent.observer.calculate_metrics()
+
 c1, c2, c3 = st.columns(3)
-c1.metric("Success Rate", f"{(df['Status']=='success').mean()*100:.1f}%")
-c2.metric("Avg Latency", f"{df['Latency'].mean():.0f} ms")
-c3.metric("Total Transactions", len(df))
+c1.metric("Success Rate", f"{metrics['success_rate']*100:.1f}%")
+c2.metric("Avg Latency", f"{metrics['avg_latency']:.0f} ms")
+c3.metric("Total Transactions", metrics["total_volume"])
+
+# One counting pass over categorical codes shared by Graph 1 and Graph 4:
+# outcome_counts[batch, status, amount bucket]
+batches = df["Batch"].cat.categories
+n_batches, n_statuses, n_buckets = len(batches), len(STATUSES), len(AMOUNT_LABELS)
+flat = (
+    df["Batch"].cat.codes.to_numpy().astype(np.int64) * n_statuses
+    + df["Status"].cat.codes.to_numpy()
+) * n_buckets + df["Amount Bucket"].cat.codes.to_numpy()
+outcome_counts = np.bincount(
+    flat, minlength=n_batches * n_statuses * n_buckets
+).reshape(n_batches, n_statuses, n_buckets)
 
 # ==================================================
 # GRAPH 1 — OUTCOMES PER BATCH (STACKED BAR)
 # ==================================================
 st.subheader("📊 Transaction Outcomes per Iteration")
 
-batch_counts = (
-    df.groupby(["Batch", "Status"])
-    .size()
-    .reset_index(name="Count")
-)
+batch_status = outcome_counts.sum(axis=2)
+b_idx, s_idx = np.nonzero(batch_status)
+batch_counts = pd.DataFrame({
+    "Batch": batches[b_idx],
+    "Status": np.asarray(STATUSES)[s_idx],
+    "Count": batch_status[b_idx, s_idx],
+})
 
 chart1 = alt.Chart(batch_counts).mark_bar().encode(
     x=alt.X("Batch:N", title="Iteration"),
@@ -175,13 +262,22 @@ st.altair_chart(chart2, use_container_width=True)
 # ==================================================
 st.subheader("📈 Failure Rate Over Time")
 
-time_fail = (
-    df.assign(is_failure=df["Status"] == "failure")
-      .set_index("Timestamp")
-      .resample("1min")["is_failure"]
-      .mean()
-      .mul(100)
+# Per-minute histogram of failures over totals, same bins as resample("1min")
+minute = df["Timestamp"].to_numpy().astype("datetime64[m]").astype(np.int64)
+first_minute = minute.min()
+minute -= first_minute
+is_failure = df["Status"].cat.codes.to_numpy() == PaymentStatus.FAILURE
+failures = np.bincount(minute, weights=is_failure)
+totals = np.bincount(minute)
+rate = np.full(len(totals), np.nan)
+np.divide(100.0 * failures, totals, out=rate, where=totals > 0)
+
+time_fail = pd.Series(
+    rate,
+    index=pd.to_datetime((first_minute + np.arange(len(rate))) * 60, unit="s"),
+    name="is_failure",
 )
+time_fail.index.name = "Timestamp"
 
 st.line_chart(time_fail)
 
@@ -190,19 +286,14 @@ st.line_chart(time_fail)
 # ==================================================
 st.subheader("💸 Failure Rate by Transaction Amount (per Iteration)")
 
-df["Amount Bucket"] = pd.cut(
-    df["Amount"],
-    bins=[0, 50, 100, 200, 500, np.inf],
-    labels=["0–50", "50–100", "100–200", "200–500", "500+"],
-)
-
-amount_fail = (
-    df.assign(is_failure=df["Status"] == "failure")
-      .groupby(["Batch", "Amount Bucket"], observed=True)["is_failure"]
-      .mean()
-      .mul(100)
-      .reset_index()
-)
+bucket_totals = outcome_counts.sum(axis=1)
+bucket_failures = outcome_counts[:, PaymentStatus.FAILURE, :]
+b_idx, a_idx = np.nonzero(bucket_totals)
+amount_fail = pd.DataFrame({
+    "Batch": batches[b_idx],
+    "Amount Bucket": np.asarray(AMOUNT_LABELS)[a_idx],
+    "is_failure": 100.0 * bucket_failures[b_idx, a_idx] / bucket_totals[b_idx, a_idx],
+})
 
 chart4 = alt.Chart(amount_fail).mark_bar().encode(
     x=alt.X("Amount Bucket:N", title="Transaction Amount ($)"),
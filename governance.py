@@ -1,17 +1,19 @@
-
-from datetime import datetime
+import time
+from collections import deque
 
 class GovernanceGuardrails:
     def __init__(self):
         self.max_autonomous_actions_per_hour = 5
         self.high_risk_actions = {"DISABLE_PAYMENT_METHOD"}
-        self.action_log = []
+        self.action_log = deque()  # monotonic timestamps, oldest first
 
     def allow(self, decision):
-        now = datetime.now()
-        last_hour = [a for a in self.action_log if (now-a).seconds<3600]
+        now = time.monotonic()
+        cutoff = now - 3600
+        while self.action_log and self.action_log[0] <= cutoff:
+            self.action_log.popleft()
 
-        if len(last_hour)>=self.max_autonomous_actions_per_hour:
+        if len(self.action_log)>=self.max_autonomous_actions_per_hour:
             return False,"Rate limit exceeded"
 
         if decision.action_type.value in self.high_risk_actions:
@@ -3,31 +3,18 @@ Interactive Dashboard for Payment Operations Agent
 Provides real-time visualization of agent behavior and metrics
 """
 
+import io
 import json
 from datetime import datetime
 from typing import Dict, List
 from agent import PaymentOpsAgent, PaymentStatus
 from collections import defaultdict
 
+import numpy as np
 
-class AgentDashboard:
-    """Real-time dashboard for monitoring agent behavior"""
-    
-    def __init__(self, agent: PaymentOpsAgent):
-        self.agent = agent
-        
-    def generate_dashboard_html(self) -> str:
-        """Generate HTML dashboard with live metrics"""
-        status = self.agent.get_status()
-        metrics = self.agent.observer.calculate_metrics()
-        
-        # Prepare data for visualization
-        patterns_data = self._prepare_patterns_data()
-        decisions_data = self._prepare_decisions_data()
-        outcomes_data = self._prepare_outcomes_data()
-        timeline_data = self._prepare_timeline_data()
-        
-        html = f"""
+
+# Static page chrome; only the header and sections are formatted per render
+_PAGE_HEAD = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -35,44 +22,44 @@ class AgentDashboard:
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Payment Operations Agent Dashboard</title>
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             padding: 20px;
             color: #333;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1400px;
             margin: 0 auto;
-        }}
+        }
         
-        .header {{
+        .header {
             background: white;
             padding: 30px;
             border-radius: 12px;
             box-shadow: 0 4px 6px rgba(0,0,0,0.1);
             margin-bottom: 20px;
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             color: #667eea;
             font-size: 32px;
             margin-bottom: 10px;
-        }}
+        }
         
-        .header .subtitle {{
+        .header .subtitle {
             color: #666;
             font-size: 16px;
-        }}
+        }
         
-        .status-indicator {{
+        .status-indicator {
             display: inline-block;
             width: 12px;
             height: 12px;
@@ -80,66 +67,66 @@ class AgentDashboard:
             background: #22c55e;
             margin-right: 8px;
             animation: pulse 2s infinite;
-        }}
+        }
         
-        @keyframes pulse {{
-            0%, 100% {{ opacity: 1; }}
-            50% {{ opacity: 0.5; }}
-        }}
+        @keyframes pulse {
+            0%, 100% { opacity: 1; }
+            50% { opacity: 0.5; }
+        }
         
-        .metrics-grid {{
+        .metrics-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
             gap: 20px;
             margin-bottom: 20px;
-        }}
+        }
         
-        .metric-card {{
+        .metric-card {
             background: white;
             padding: 24px;
             border-radius: 12px;
             box-shadow: 0 4px 6px rgba(0,0,0,0.1);
             transition: transform 0.2s;
-        }}
+        }
         
-        .metric-card:hover {{
+        .metric-card:hover {
             transform: translateY(-4px);
             box-shadow: 0 8px 12px rgba(0,0,0,0.15);
-        }}
+        }
         
-        .metric-label {{
+        .metric-label {
             color: #666;
             font-size: 14px;
             text-transform: uppercase;
             letter-spacing: 0.5px;
             margin-bottom: 8px;
-        }}
+        }
         
-        .metric-value {{
+        .metric-value {
             font-size: 36px;
             font-weight: 700;
             color: #667eea;
             margin-bottom: 4px;
-        }}
+        }
         
-        .metric-change {{
+        .metric-change {
             font-size: 14px;
             color: #22c55e;
-        }}
+        }
         
-        .metric-change.negative {{
+        .metric-change.negative {
             color: #ef4444;
-        }}
+        }
         
-        .section {{
+        .section {
             background: white;
             padding: 30px;
             border-radius: 12px;
             box-shadow: 0 4px 6px rgba(0,0,0,0.1);
             margin-bottom: 20px;
-        }}
+        }
         
-        .section-title {{
+        .section-title {
             font-size: 20px;
             font-weight: 600;
             margin-bottom: 20px;
@@ -147,78 +134,78 @@ class AgentDashboard:
             display: flex;
             align-items: center;
             gap: 10px;
-        }}
+        }
         
-        .pattern-item {{
+        .pattern-item {
             background: #f8fafc;
             padding: 16px;
             border-radius: 8px;
             margin-bottom: 12px;
             border-left: 4px solid #667eea;
-        }}
+        }
         
-        .pattern-header {{
+        .pattern-header {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 8px;
-        }}
+        }
         
-        .pattern-type {{
+        .pattern-type {
             font-weight: 600;
             color: #333;
-        }}
+        }
         
-        .severity-badge {{
+        .severity-badge {
             padding: 4px 12px;
             border-radius: 12px;
             font-size: 12px;
             font-weight: 600;
-        }}
+        }
         
-        .severity-high {{
+        .severity-high {
             background: #fee2e2;
             color: #dc2626;
-        }}
+        }
         
-        .severity-medium {{
+        .severity-medium {
             background: #fef3c7;
             color: #d97706;
-        }}
+        }
         
-        .severity-low {{
+        .severity-low {
             background: #dbeafe;
             color: #2563eb;
-        }}
+        }
         
-        .decision-item {{
+        .decision-item {
             background: #f8fafc;
             padding: 16px;
             border-radius: 8px;
             margin-bottom: 12px;
             border-left: 4px solid #22c55e;
-        }}
+        }
         
-        .approval-badge {{
+        .approval-badge {
             padding: 4px 12px;
             border-radius: 12px;
             font-size: 12px;
             font-weight: 600;
             background: #dcfce7;
             color: #16a34a;
-        }}
+        }
         
-        .approval-badge.supervised {{
+        .approval-badge.supervised {
             background: #fef3c7;
             color: #d97706;
-        }}
+        }
         
-        .timeline {{
+        .timeline {
             position: relative;
             padding-left: 40px;
-        }}
+        }
         
-        .timeline::before {{
+        .timeline::before {
             content: '';
             position: absolute;
             left: 10px;
@@ -226,14 +213,14 @@ class AgentDashboard:
             bottom: 0;
             width: 2px;
             background: #e5e7eb;
-        }}
+        }
         
-        .timeline-item {{
+        .timeline-item {
             position: relative;
             margin-bottom: 24px;
-        }}
+        }
         
-        .timeline-item::before {{
+        .timeline-item::before {
             content: '';
             position: absolute;
             left: -34px;
@@ -244,133 +231,234 @@ class AgentDashboard:
             background: #667eea;
             border: 3px solid white;
             box-shadow: 0 0 0 2px #667eea;
-        }}
+        }
         
-        .timeline-time {{
+        .timeline-time {
             font-size: 12px;
             color: #666;
             margin-bottom: 4px;
-        }}
+        }
         
-        .timeline-content {{
+        .timeline-content {
             background: #f8fafc;
             padding: 12px;
             border-radius: 8px;
-        }}
+        }
         
-        .effectiveness-grid {{
+        .effectiveness-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 16px;
-        }}
+        }
         
-        .effectiveness-card {{
+        .effectiveness-card {
             background: #f8fafc;
             padding: 16px;
             border-radius: 8px;
-        }}
+        }
         
-        .effectiveness-title {{
+        .effectiveness-title {
             font-size: 14px;
             color: #666;
             margin-bottom: 8px;
-        }}
+        }
         
-        .effectiveness-stat {{
+        .effectiveness-stat {
             font-size: 24px;
             font-weight: 700;
             color: #667eea;
-        }}
+        }
         
-        .empty-state {{
+        .empty-state {
             text-align: center;
             padding: 40px;
             color: #999;
-        }}
+        }
         
-        .empty-state-icon {{
+        .empty-state-icon {
             font-size: 48px;
             margin-bottom: 16px;
-        }}
+        }
     </style>
 </head>
 <body>
     <div class="container">
-        <div class="header">
+"""
+
+_HEADER_TMPL = """        <div class="header">
             <h1>
                 <span class="status-indicator"></span>
                 Payment Operations Agent
             </h1>
-            <p class="subtitle">Real-time autonomous payment optimization • Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+            <p class="subtitle">Real-time autonomous payment optimization • Updated: {updated}</p>
         </div>
         
         <div class="metrics-grid">
             <div class="metric-card">
                 <div class="metric-label">Success Rate</div>
-                <div class="metric-value">{metrics['success_rate']:.1%}</div>
+                <div class="metric-value">{success_rate:.1%}</div>
                 <div class="metric-change">Live metric</div>
             </div>
             
             <div class="metric-card">
                 <div class="metric-label">Avg Latency</div>
-                <div class="metric-value">{metrics['avg_latency']:.0f}ms</div>
+                <div class="metric-value">{avg_latency:.0f}ms</div>
                 <div class="metric-change">Current performance</div>
             </div>
             
             <div class="metric-card">
                 <div class="metric-label">Transactions</div>
-                <div class="metric-value">{status['total_signals_observed']}</div>
+                <div class="metric-value">{total_signals_observed}</div>
                 <div class="metric-change">Total observed</div>
             </div>
             
             <div class="metric-card">
                 <div class="metric-label">Patterns Detected</div>
-                <div class="metric-value">{status['active_patterns']}</div>
-                <div class="metric-change">{status['total_decisions']} decisions made</div>
-            </div>
-        </div>
-        
-        <div class="section">
-            <div class="section-title">
-                <span>🔍</span> Active Patterns
+                <div class="metric-value">{active_patterns}</div>
+                <div class="metric-change">{total_decisions} decisions made</div>
             </div>
-            {patterns_data}
         </div>
-        
+"""
+
+_SECTION_TMPL = """        
         <div class="section">
             <div class="section-title">
-                <span>🧠</span> Recent Decisions
+                <span>{icon}</span> {title}
             </div>
-            {decisions_data}
+            {body}
         </div>
-        
-        <div class="section">
-            <div class="section-title">
-                <span>⚡</span> Action Outcomes
+"""
+
+_TIMELINE_TMPL = """<div class="timeline">
+                {body}
+            </div>"""
+
+_PAGE_TAIL = """    </div>
+</body>
+</html>
+"""
+
+# Severity > 0.4 is MEDIUM, > 0.7 is HIGH (edges are exclusive)
+_SEVERITY_EDGES = np.array([0.4, 0.7])
+_SEVERITY_CLASSES = np.array(['severity-low', 'severity-medium', 'severity-high'])
+_SEVERITY_LABELS = np.array(['LOW', 'MEDIUM', 'HIGH'])
+
+# Per-item templates filled with str.format_map
+_PATTERN_TMPL = """
+            <div class="pattern-item">
+                <div class="pattern-header">
+                    <div class="pattern-type">{pattern_type}</div>
+                    <span class="severity-badge {severity_class}">{severity_label}</span>
+                </div>
+                <div style="color: #666; margin-bottom: 8px;">{description}</div>
+                <div style="font-size: 12px; color: #999;">
+                    Affected: {affected_dimension} • Confidence: {confidence:.0%}
+                </div>
             </div>
-            {outcomes_data}
-        </div>
-        
-        <div class="section">
-            <div class="section-title">
-                <span>📚</span> Learning Effectiveness
+            """
+
+_DECISION_TMPL = """
+            <div class="decision-item">
+                <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 8px;">
+                    <div style="font-weight: 600; color: #333;">
+                        {action}
+                    </div>
+                    <span class="approval-badge {approval_class}">{approval_label}</span>
+                </div>
+                <div style="color: #666; margin-bottom: 8px;">{rationale}</div>
+                <div style="font-size: 12px; color: #999;">
+                    {status} • {time} • Expected Impact: {expected_impact:+.1%}
+                </div>
             </div>
-            {self._prepare_effectiveness_data()}
-        </div>
-        
-        <div class="section">
-            <div class="section-title">
-                <span>📅</span> Event Timeline
+            """
+
+_OUTCOME_TMPL = """
+            <div class="timeline-item">
+                <div class="timeline-time">{time}</div>
+                <div class="timeline-content">
+                    <div style="font-weight: 600; margin-bottom: 4px;">
+                        {action}
+                    </div>
+                    <div style="color: #666; font-size: 14px; margin-bottom: 8px;">
+                        {learning_insights}
+                    </div>
+                    <div style="font-size: 12px;">
+                        <span class="metric-change {impact_class}">
+                            Impact: {impact:+.2%} success rate
+                        </span>
+                    </div>
+                </div>
             </div>
-            <div class="timeline">
-                {timeline_data}
+            """
+
+_EFFECTIVENESS_TMPL = """
+                <div class="effectiveness-card">
+                    <div class="effectiveness-title">{action}</div>
+                    <div class="effectiveness-stat">{success_rate:.0%}</div>
+                    <div style="font-size: 12px; color: #666; margin-top: 4px;">
+                        {count} executions • Avg impact: {avg_impact:+.1%}
+                    </div>
+                </div>
+                """
+
+_EVENT_TMPL = """
+            <div class="timeline-item">
+                <div class="timeline-time">{time}</div>
+                <div class="timeline-content">
+                    <div style="font-weight: 600; margin-bottom: 4px;">{content}</div>
+                    <div style="color: #666; font-size: 14px;">{detail}</div>
+                </div>
             </div>
-        </div>
-    </div>
-</body>
-</html>
-"""
-        return html
+            """
+
+
+def _clock_times(timestamps) -> List[str]:
+    """Format naive datetimes as HH:MM:SS in one vectorized pass
+    
+    Equivalent to strftime('%H:%M:%S') for naive datetimes. Aware ones
+    would be converted to UTC by NumPy, so callers pass naive timestamps.
+    """
+    if not timestamps:
+        return []
+    ts = np.array(timestamps, dtype='datetime64[s]')
+    return np.char.partition(np.datetime_as_string(ts, unit='s'), 'T')[:, 2].tolist()
+
+
+class AgentDashboard:
+    """Real-time dashboard for monitoring agent behavior"""
+    
+    def __init__(self, agent: PaymentOpsAgent):
+        self.agent = agent
+        
+    def generate_dashboard_html(self) -> str:
+        """Generate HTML dashboard with live metrics"""
+        status = self.agent.get_status()
+        metrics = self.agent.observer.calculate_metrics()
+        
+        sections = (
+            ('🔍', 'Active Patterns', self._prepare_patterns_data()),
+            ('🧠', 'Recent Decisions', self._prepare_decisions_data()),
+            ('⚡', 'Action Outcomes', self._prepare_outcomes_data()),
+            ('📚', 'Learning Effectiveness', self._prepare_effectiveness_data()),
+            ('📅', 'Event Timeline', _TIMELINE_TMPL.format(body=self._prepare_timeline_data())),
+        )
+        
+        buf = io.StringIO()
+        buf.write(_PAGE_HEAD)
+        buf.write(_HEADER_TMPL.format_map({
+            'updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'success_rate': metrics['success_rate'],
+            'avg_latency': metrics['avg_latency'],
+            'total_signals_observed': status['total_signals_observed'],
+            'active_patterns': status['active_patterns'],
+            'total_decisions': status['total_decisions'],
+        }))
+        buf.writelines(
+            _SECTION_TMPL.format(icon=icon, title=title, body=body)
+            for icon, title, body in sections
+        )
+        buf.write(_PAGE_TAIL)
+        return buf.getvalue()
     
     def _prepare_patterns_data(self) -> str:
         """Prepare patterns HTML"""
@@ -382,23 +470,21 @@ class AgentDashboard:
         # Sort by severity
         patterns.sort(key=lambda p: p.severity, reverse=True)
         
+        top = patterns[:10]  # Show top 10
+        severity_idx = np.searchsorted(_SEVERITY_EDGES, [p.severity for p in top], side='left')
+        
         html_parts = []
-        for pattern in patterns[:10]:  # Show top 10
-            severity_class = 'severity-high' if pattern.severity > 0.7 else 'severity-medium' if pattern.severity > 0.4 else 'severity-low'
-            severity_label = 'HIGH' if pattern.severity > 0.7 else 'MEDIUM' if pattern.severity > 0.4 else 'LOW'
-            
-            html_parts.append(f"""
-            <div class="pattern-item">
-                <div class="pattern-header">
-                    <div class="pattern-type">{pattern.pattern_type.replace('_', ' ').title()}</div>
-                    <span class="severity-badge {severity_class}">{severity_label}</span>
-                </div>
-                <div style="color: #666; margin-bottom: 8px;">{pattern.description}</div>
-                <div style="font-size: 12px; color: #999;">
-                    Affected: {pattern.affected_dimension} • Confidence: {pattern.confidence:.0%}
-                </div>
-            </div>
-            """)
+        for pattern, severity_class, severity_label in zip(
+            top, _SEVERITY_CLASSES[severity_idx], _SEVERITY_LABELS[severity_idx]
+        ):
+            html_parts.append(_PATTERN_TMPL.format_map({
+                'pattern_type': pattern.pattern_type.replace('_', ' ').title(),
+                'severity_class': severity_class,
+                'severity_label': severity_label,
+                'description': pattern.description,
+                'affected_dimension': pattern.affected_dimension,
+                'confidence': pattern.confidence,
+            }))
         
         return ''.join(html_parts)
     
@@ -412,26 +498,24 @@ class AgentDashboard:
         # Get most recent
         decisions.sort(key=lambda d: d.timestamp, reverse=True)
         
+        recent = decisions[:10]
+        times = _clock_times([d.timestamp for d in recent])
+        
         html_parts = []
-        for decision in decisions[:10]:
+        for decision, time in zip(recent, times):
             approval_class = 'supervised' if decision.requires_approval else ''
             approval_label = '⏳ REQUIRES APPROVAL' if decision.requires_approval else '✓ AUTONOMOUS'
             status = '✓ Executed' if decision.executed else '⏳ Pending'
             
-            html_parts.append(f"""
-            <div class="decision-item">
-                <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 8px;">
-                    <div style="font-weight: 600; color: #333;">
-                        {decision.action_type.value.replace('_', ' ').title()}
-                    </div>
-                    <span class="approval-badge {approval_class}">{approval_label}</span>
-                </div>
-                <div style="color: #666; margin-bottom: 8px;">{decision.rationale}</div>
-                <div style="font-size: 12px; color: #999;">
-                    {status} • {decision.timestamp.strftime('%H:%M:%S')} • Expected Impact: {decision.expected_impact.get('success_rate_delta', 0):+.1%}
-                </div>
-            </div>
-            """)
+            html_parts.append(_DECISION_TMPL.format_map({
+                'action': decision.action_type.value.replace('_', ' ').title(),
+                'approval_class': approval_class,
+                'approval_label': approval_label,
+                'rationale': decision.rationale,
+                'status': status,
+                'time': time,
+                'expected_impact': decision.expected_impact.get('success_rate_delta', 0),
+            }))
         
         return ''.join(html_parts)
     
@@ -444,29 +528,21 @@ class AgentDashboard:
         
         outcomes.sort(key=lambda o: o.executed_at, reverse=True)
         
+        recent = outcomes[:10]
+        times = _clock_times([o.executed_at for o in recent])
+        
         html_parts = []
-        for outcome in outcomes[:10]:
+        for outcome, time in zip(recent, times):
             impact = outcome.actual_impact.get('success_rate_delta', 0)
             impact_class = '' if impact >= 0 else 'negative'
             
-            html_parts.append(f"""
-            <div class="timeline-item">
-                <div class="timeline-time">{outcome.executed_at.strftime('%H:%M:%S')}</div>
-                <div class="timeline-content">
-                    <div style="font-weight: 600; margin-bottom: 4px;">
-                        {outcome.action_type.value.replace('_', ' ').title()}
-                    </div>
-                    <div style="color: #666; font-size: 14px; margin-bottom: 8px;">
-                        {outcome.learning_insights}
-                    </div>
-                    <div style="font-size: 12px;">
-                        <span class="metric-change {impact_class}">
-                            Impact: {impact:+.2%} success rate
-                        </span>
-                    </div>
-                </div>
-            </div>
-            """)
+            html_parts.append(_OUTCOME_TMPL.format_map({
+                'time': time,
+                'action': outcome.action_type.value.replace('_', ' ').title(),
+                'learning_insights': outcome.learning_insights,
+                'impact_class': impact_class,
+                'impact': impact,
+            }))
         
         return ''.join(html_parts)
     
@@ -480,15 +556,12 @@ class AgentDashboard:
         html_parts = []
         for action_type, stats in effectiveness.items():
             if stats['count'] > 0:
-                html_parts.append(f"""
-                <div class="effectiveness-card">
-                    <div class="effectiveness-title">{action_type.value.replace('_', ' ').title()}</div>
-                    <div class="effectiveness-stat">{stats['success_rate']:.0%}</div>
-                    <div style="font-size: 12px; color: #666; margin-top: 4px;">
-                        {stats['count']} executions • Avg impact: {stats['avg_impact']:+.1%}
-                    </div>
-                </div>
-                """)
+                html_parts.append(_EFFECTIVENESS_TMPL.format_map({
+                    'action': action_type.value.replace('_', ' ').title(),
+                    'success_rate': stats['success_rate'],
+                    'count': stats['count'],
+                    'avg_impact': stats['avg_impact'],
+                }))
         
         return f'<div class="effectiveness-grid">{"".join(html_parts)}</div>'
     
@@ -518,17 +591,16 @@ class AgentDashboard:
         
         events.sort(key=lambda e: e['time'], reverse=True)
         
+        recent = events[:15]
+        times = _clock_times([e['time'] for e in recent])
+        
         html_parts = []
-        for event in events[:15]:
-            html_parts.append(f"""
-            <div class="timeline-item">
-                <div class="timeline-time">{event['time'].strftime('%H:%M:%S')}</div>
-                <div class="timeline-content">
-                    <div style="font-weight: 600; margin-bottom: 4px;">{event['content']}</div>
-                    <div style="color: #666; font-size: 14px;">{event['detail']}</div>
-                </div>
-            </div>
-            """)
+        for event, time in zip(recent, times):
+            html_parts.append(_EVENT_TMPL.format_map({
+                'time': time,
+                'content': event['content'],
+                'detail': event['detail'],
+            }))
         
         return ''.join(html_parts)
     
@@ -0,0 +1,174 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Compiled scalar payment generator
+Typed port of PaymentSimulator's per-transaction model, drawing from an
+inlined xoshiro256** generator. Build in place with:
+
+    cythonize -i simulation/_simulator.pyx
+"""
+
+from cpython.list cimport PyList_New, PyList_SET_ITEM
+from cpython.ref cimport Py_INCREF
+from libc.stdint cimport uint64_t
+from libc.math cimport round as c_round
+
+from datetime import timedelta
+
+from core.agent import PaymentSignal, PaymentStatus
+
+
+# Must match ScenarioType in simulation/simulator.py
+cdef enum:
+    ISSUER_DEGRADATION = 0
+    METHOD_FATIGUE = 1
+    RETRY_STORM = 2
+    LATENCY_SPIKE = 3
+    ERROR_CLUSTERING = 4
+
+
+# splitmix64 constants, typed so the arithmetic wraps in C
+cdef uint64_t _GOLDEN = 0x9E3779B97F4A7C15
+cdef uint64_t _MIX1 = 0xBF58476D1CE4E5B9
+cdef uint64_t _MIX2 = 0x94D049BB133111EB
+
+
+cdef inline uint64_t _rotl(uint64_t x, int k):
+    return (x << k) | (x >> (64 - k))
+
+
+cdef class _FastSim:
+    """Generates PaymentSignal batches for one PaymentSimulator"""
+
+    cdef uint64_t s0, s1, s2, s3
+    cdef object sim
+
+    def __init__(self, simulator, uint64_t seed):
+        cdef uint64_t z
+        cdef int i
+        cdef uint64_t state[4]
+        self.sim = simulator
+        # Expand the seed with splitmix64, as recommended for xoshiro
+        for i in range(4):
+            seed += _GOLDEN
+            z = seed
+            z = (z ^ (z >> 30)) * _MIX1
+            z = (z ^ (z >> 27)) * _MIX2
+            state[i] = z ^ (z >> 31)
+        self.s0, self.s1, self.s2, self.s3 = state[0], state[1], state[2], state[3]
+
+    cdef inline uint64_t _next(self):
+        cdef uint64_t result = _rotl(self.s1 * 5, 7) * 9
+        cdef uint64_t t = self.s1 << 17
+        self.s2 ^= self.s0
+        self.s3 ^= self.s1
+        self.s1 ^= self.s2
+        self.s0 ^= self.s3
+        self.s2 ^= t
+        self.s3 = _rotl(self.s3, 45)
+        return result
+
+    cdef inline double _random(self):
+        return (self._next() >> 11) * (1.0 / 9007199254740992.0)
+
+    cdef inline long _randint(self, long a, long b):
+        return a + <long>(self._random() * (b - a + 1))
+
+    cpdef list generate_batch(self, int count):
+        """Generate count transactions with the scalar model"""
+        sim = self.sim
+        cdef tuple methods = sim.payment_methods
+        cdef tuple issuers = sim.issuer_banks
+        cdef tuple processors = sim.processors
+        cdef tuple currencies = sim.currencies
+        cdef tuple categories = sim.merchant_categories
+        cdef Py_ssize_t n_methods = len(methods), n_issuers = len(issuers)
+        cdef Py_ssize_t n_processors = len(processors), n_currencies = len(currencies)
+        cdef Py_ssize_t n_categories = len(categories), n_errors = len(sim.error_codes)
+
+        cdef tuple errors = tuple(sim.error_vocabulary)
+        encoded = sim._encode_scenarios()
+        cdef long long[:] type_code = encoded[0]
+        cdef long long[:] affected_code = encoded[1]
+        cdef long long[:] start = encoded[2]
+        cdef long long[:] end = encoded[3]
+        cdef double[:] severity = encoded[4]
+        cdef double[:] sev_complement = encoded[5]
+        cdef long long[:] lat_issuer = encoded[6]
+        cdef long long[:] lat_spike = encoded[7]
+        cdef Py_ssize_t n_scenarios = type_code.shape[0]
+
+        success = PaymentStatus.SUCCESS
+        failure = PaymentStatus.FAILURE
+        t0 = sim._now()
+
+        cdef long long counter = sim.transaction_counter
+        cdef Py_ssize_t i, s, method, issuer
+        cdef long kind, base_latency, retry_count, latency, error
+        cdef double success_prob, amount
+        cdef list out = PyList_New(count)
+
+        for i in range(count):
+            counter += 1
+            method = <Py_ssize_t>(self._random() * n_methods)
+            issuer = <Py_ssize_t>(self._random() * n_issuers)
+            success_prob = 0.85
+            base_latency = self._randint(200, 800)
+            retry_count = 0
+            error = -1
+
+            # Apply degradation scenarios
+            for s in range(n_scenarios):
+                if counter < start[s] or counter > end[s]:
+                    continue
+                kind = type_code[s]
+                if kind == ISSUER_DEGRADATION:
+                    if issuer == affected_code[s]:
+                        success_prob *= sev_complement[s]
+                        base_latency += lat_issuer[s]
+                elif kind == METHOD_FATIGUE:
+                    if method == affected_code[s]:
+                        success_prob *= sev_complement[s]
+                elif kind == RETRY_STORM:
+                    if self._random() < severity[s]:
+                        retry_count = self._randint(1, 4)
+                        success_prob *= 0.7
+                elif kind == LATENCY_SPIKE:
+                    base_latency += lat_spike[s]
+                elif kind == ERROR_CLUSTERING:
+                    if self._random() < severity[s]:
+                        error = affected_code[s]
+                        success_prob = 0.1
+
+            # Determine outcome
+            if self._random() < success_prob:
+                status = success
+                error_code = None
+            else:
+                status = failure
+                if error < 0:
+                    error = <long>(self._random() * n_errors)
+                error_code = errors[error]
+
+            latency = base_latency + self._randint(-100, 100)
+            amount = c_round((10 + 990 * self._random()) * 100) / 100
+
+            signal = PaymentSignal(
+                transaction_id="txn_%06d" % counter,
+                timestamp=t0 + timedelta(microseconds=i),
+                status=status,
+                payment_method=methods[method],
+                issuer_bank=issuers[issuer],
+                processor=processors[<Py_ssize_t>(self._random() * n_processors)],
+                amount=amount,
+                currency=currencies[<Py_ssize_t>(self._random() * n_currencies)],
+                latency_ms=latency if latency > 100 else 100,
+                error_code=error_code,
+                retry_count=retry_count,
+                merchant_category=categories[<Py_ssize_t>(self._random() * n_categories)],
+                risk_score=self._random()
+            )
+            Py_INCREF(signal)
+            PyList_SET_ITEM(out, i, signal)
+
+        sim.transaction_counter = counter
+        return out
@@ -3,111 +3,619 @@ Payment Data Simulator
 Generates realistic payment transaction data for testing the agent
 """
 
+import bisect
 import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import List, Dict
+from enum import IntEnum
+from typing import List, Dict, Iterator, Optional
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; scenarios fall back to NumPy masks
+    njit = None
+
+try:
+    from simulation._simulator import _FastSim
+except ImportError:  # compiled extension not built; see simulation/_simulator.pyx
+    _FastSim = None
+
 from core.agent import PaymentSignal, PaymentStatus
 
 
+class ScenarioType(IntEnum):
+    """Integer codes for degradation scenario types"""
+    ISSUER_DEGRADATION = 0
+    METHOD_FATIGUE = 1
+    RETRY_STORM = 2
+    LATENCY_SPIKE = 3
+    ERROR_CLUSTERING = 4
+
+
+# Scratch buffers are kept for this many most recently used batch sizes
+_MAX_BUFFERED_COUNTS = 4
+
+# Dtype of batch error-code columns; -1 means no error
+_ERROR_CODE_DTYPE = np.int16
+
+# Integer draw pools for random.choices in the stdlib batch path
+_BASE_LATENCIES = range(200, 801)
+_LATENCY_VARIANCES = range(-100, 101)
+
+
+def _apply_scenarios_loop(counters, issuer_idx, method_idx, retry_roll, retry_draw, cluster_roll,
+                          type_code, affected_code, start, end, severity,
+                          sev_complement, lat_issuer, lat_spike,
+                          success_prob, base_latency, retry_count, error_code):
+    """Apply encoded scenarios to batch arrays in place, one fused pass"""
+    for i in range(counters.shape[0]):
+        counter = counters[i]
+        for s in range(type_code.shape[0]):
+            if counter < start[s] or counter > end[s]:
+                continue
+            kind = type_code[s]
+            if kind == ScenarioType.ISSUER_DEGRADATION:
+                if issuer_idx[i] == affected_code[s]:
+                    success_prob[i] *= sev_complement[s]
+                    base_latency[i] += lat_issuer[s]
+            elif kind == ScenarioType.METHOD_FATIGUE:
+                if method_idx[i] == affected_code[s]:
+                    success_prob[i] *= sev_complement[s]
+            elif kind == ScenarioType.RETRY_STORM:
+                if retry_roll[i] < severity[s]:
+                    retry_count[i] = retry_draw[i]
+                    success_prob[i] *= 0.7
+            elif kind == ScenarioType.LATENCY_SPIKE:
+                base_latency[i] += lat_spike[s]
+            elif kind == ScenarioType.ERROR_CLUSTERING:
+                if cluster_roll[i] < severity[s]:
+                    error_code[i] = affected_code[s]
+                    success_prob[i] = 0.1
+
+
+def _apply_scenarios_masked(counters, issuer_idx, method_idx, retry_roll, retry_draw, cluster_roll,
+                            type_code, affected_code, start, end, severity,
+                            sev_complement, lat_issuer, lat_spike,
+                            success_prob, base_latency, retry_count, error_code):
+    """Apply encoded scenarios to batch arrays in place, one mask per scenario"""
+    for s in range(len(type_code)):
+        active = (counters >= start[s]) & (counters <= end[s])
+        if not active.any():
+            continue
+        kind = type_code[s]
+        sev = severity[s]
+        
+        if kind == ScenarioType.ISSUER_DEGRADATION:
+            m = active & (issuer_idx == affected_code[s])
+            success_prob[m] *= sev_complement[s]
+            base_latency[m] += lat_issuer[s]
+            
+        elif kind == ScenarioType.METHOD_FATIGUE:
+            m = active & (method_idx == affected_code[s])
+            success_prob[m] *= sev_complement[s]
+            
+        elif kind == ScenarioType.RETRY_STORM:
+            m = active & (retry_roll < sev)
+            retry_count[m] = retry_draw[m]
+            success_prob[m] *= 0.7
+            
+        elif kind == ScenarioType.LATENCY_SPIKE:
+            base_latency[active] += lat_spike[s]
+            
+        elif kind == ScenarioType.ERROR_CLUSTERING:
+            m = active & (cluster_roll < sev)
+            error_code[m] = affected_code[s]
+            success_prob[m] = 0.1
+
+
+if njit is not None:
+    _apply_scenarios = njit(cache=True)(_apply_scenarios_loop)
+else:
+    _apply_scenarios = _apply_scenarios_masked
+
+
+@dataclass(slots=True)
+class Scenario:
+    """A degradation applied to transactions numbered start..end inclusive"""
+    type: str
+    affected: str
+    start: int
+    end: int
+    severity: float  # 0.0 to 1.0
+    type_code: int = -1  # ScenarioType, or -1 for unknown types
+    affected_code: int = -1  # issuer, method or error index; -1 if none
+    
+    # Derived from severity once, instead of on every covered transaction
+    sev_complement: float = field(init=False)
+    lat_issuer: int = field(init=False)
+    lat_spike: int = field(init=False)
+    
+    def __post_init__(self):
+        self.sev_complement = 1 - self.severity
+        self.lat_issuer = int(300 * self.severity)
+        self.lat_spike = int(1000 * self.severity)
+
+
+def _generate_columns_worker(simulator, start_counter, count, seed_seq):
+    """Generate one sub-batch of columns in a worker process"""
+    simulator.transaction_counter = start_counter
+    simulator.rng = np.random.Generator(np.random.SFC64(seed_seq))
+    return simulator.generate_batch_columns(count)
+
+
 class PaymentSimulator:
     """Simulates realistic payment transaction streams"""
     
-    def __init__(self):
-        self.payment_methods = ['visa', 'mastercard', 'amex', 'discover', 'paypal']
-        self.issuer_banks = ['chase', 'bofa', 'wells_fargo', 'citi', 'capital_one']
-        self.processors = ['stripe', 'adyen', 'braintree', 'square']
-        self.error_codes = ['E001_INSUFFICIENT_FUNDS', 'E002_CARD_DECLINED', 'E003_NETWORK_ERROR', 
-                           'E004_TIMEOUT', 'E005_FRAUD_SUSPECTED', 'E006_INVALID_CARD']
-        self.currencies = ['USD', 'EUR', 'GBP', 'CAD']
-        self.merchant_categories = ['retail', 'travel', 'food', 'entertainment', 'services']
+    def __init__(self, seed: Optional[int] = None):
+        self.payment_methods = ('visa', 'mastercard', 'amex', 'discover', 'paypal')
+        self.issuer_banks = ('chase', 'bofa', 'wells_fargo', 'citi', 'capital_one')
+        self.processors = ('stripe', 'adyen', 'braintree', 'square')
+        self.error_codes = ('E001_INSUFFICIENT_FUNDS', 'E002_CARD_DECLINED', 'E003_NETWORK_ERROR', 
+                           'E004_TIMEOUT', 'E005_FRAUD_SUSPECTED', 'E006_INVALID_CARD')
+        self.currencies = ('USD', 'EUR', 'GBP', 'CAD')
+        self.merchant_categories = ('retail', 'travel', 'food', 'entertainment', 'services')
         
         # Simulate degradation scenarios
-        self.degradation_scenarios = []
+        self.degradation_scenarios: List[Scenario] = []
+        self._scenario_columns = None  # encoded arrays, built on first batch
         self.transaction_counter = 0
         
+        # Activation/expiry events for the scalar path: (counter, delta, index)
+        self._events = []
+        self._events_sorted = True
+        self._event_ptr = 0
+        self._active = []  # indices of active scenarios, in insertion order
+        
+        # Counter range any scenario covers; outside it the loop is skipped
+        self._min_start = float('inf')
+        self._max_end = float('-inf')
+        
+        # Bound stdlib callables for the scalar generate_payment path
+        stdlib_rng = random.Random(seed)
+        self._rand = stdlib_rng.random
+        self._randint = stdlib_rng.randint
+        self._uniform = stdlib_rng.uniform
+        self._choices = stdlib_rng.choices
+        self._now = datetime.now
+        
+        # Bulk random source for generate_batch; child streams for workers
+        # are spawned from the same seed sequence
+        self._seed_seq = np.random.SeedSequence(seed)
+        self.rng = np.random.Generator(np.random.SFC64(self._seed_seq))
+        
+        # Error codes by integer code: the random pool plus any clustered codes
+        self.error_vocabulary = list(self.error_codes)
+        
+        # Compiled generator, created on first generate_batch_compiled call
+        self._fast = None
+        
+        # Reused scratch arrays for generate_batch_columns, keyed by count
+        self._buffers: Dict[int, Dict[str, np.ndarray]] = {}
+        
+    def __getstate__(self):
+        # Scratch buffers are per-process; don't ship them to workers
+        state = self.__dict__.copy()
+        state['_buffers'] = {}
+        return state
+        
     def add_degradation_scenario(self, scenario_type: str, affected_dimension: str, 
                                  start_after: int, duration: int, severity: float):
         """Add a degradation scenario to simulate"""
-        self.degradation_scenarios.append({
-            'type': scenario_type,
-            'affected': affected_dimension,
-            'start': start_after,
-            'end': start_after + duration,
-            'severity': severity  # 0.0 to 1.0
-        })
+        index = len(self.degradation_scenarios)
+        self._events.append((start_after, 1, index))
+        self._events.append((start_after + duration + 1, -1, index))
+        self._events_sorted = False
+        self._min_start = min(self._min_start, start_after)
+        self._max_end = max(self._max_end, start_after + duration)
+        
+        type_code = ScenarioType.__members__.get(scenario_type.upper(), -1)
+        self.degradation_scenarios.append(Scenario(
+            type=scenario_type,
+            affected=affected_dimension,
+            start=start_after,
+            end=start_after + duration,
+            severity=severity,
+            type_code=type_code,
+            affected_code=self._code_for(type_code, affected_dimension),
+        ))
+        self._scenario_columns = None
         
     def generate_payment(self) -> PaymentSignal:
         """Generate a single payment transaction"""
-        self.transaction_counter += 1
+        rand = self._rand
+        randint = self._randint
+        return self._generate_one(
+            self.payment_methods[int(rand() * len(self.payment_methods))],
+            self.issuer_banks[int(rand() * len(self.issuer_banks))],
+            self.processors[int(rand() * len(self.processors))],
+            self.currencies[int(rand() * len(self.currencies))],
+            self.merchant_categories[int(rand() * len(self.merchant_categories))],
+            self.error_codes[int(rand() * len(self.error_codes))],
+            randint(200, 800),
+            randint(-100, 100),
+            self._now(),
+        )
+        
+    def generate_batch_stdlib(self, count: int) -> List[PaymentSignal]:
+        """Generate a batch of payment transactions with the stdlib random module
+        
+        Categorical fields and integer latency draws are prefetched with one
+        random.choices call each; every row then runs the scalar model.
+        The clock is read once and rows are stamped a microsecond apart.
+        """
+        choices = self._choices
+        t0 = self._now()
+        return [
+            self._generate_one(*row, t0 + timedelta(microseconds=i))
+            for i, row in enumerate(zip(
+                choices(self.payment_methods, k=count),
+                choices(self.issuer_banks, k=count),
+                choices(self.processors, k=count),
+                choices(self.currencies, k=count),
+                choices(self.merchant_categories, k=count),
+                choices(self.error_codes, k=count),
+                choices(_BASE_LATENCIES, k=count),
+                choices(_LATENCY_VARIANCES, k=count),
+            ))
+        ]
         
-        # Base transaction
-        payment_method = random.choice(self.payment_methods)
-        issuer = random.choice(self.issuer_banks)
-        processor = random.choice(self.processors)
+    def generate_batch_compiled(self, count: int) -> List[PaymentSignal]:
+        """Generate a batch with the compiled scalar model
+        
+        Uses the Cython extension in simulation/_simulator.pyx when it has
+        been built, otherwise falls back to generate_batch_stdlib.
+        """
+        if _FastSim is None:
+            return self.generate_batch_stdlib(count)
+        if self._fast is None:
+            self._fast = _FastSim(self, int(self._seed_seq.generate_state(1, np.uint64)[0]))
+        return self._fast.generate_batch(count)
+        
+    def _generate_one(self, payment_method: str, issuer: str, processor: str,
+                      currency: str, merchant_category: str, fallback_error: str,
+                      base_latency: int, variance: int, timestamp: datetime,
+                      _S=PaymentStatus.SUCCESS, _F=PaymentStatus.FAILURE,
+                      _signal=PaymentSignal, _max=max, _round=round) -> PaymentSignal:
+        """Run the scalar transaction model on pre-drawn categorical values
+        
+        The trailing defaults bind globals and builtins as fast locals;
+        callers never pass them.
+        """
+        self.transaction_counter += 1
+        rand = self._rand
+        randint = self._randint
         
         # Default success probability
         success_prob = 0.85
-        base_latency = random.randint(200, 800)
         retry_count = 0
         error_code = None
         
         # Apply degradation scenarios
-        for scenario in self.degradation_scenarios:
-            if scenario['start'] <= self.transaction_counter <= scenario['end']:
-                if scenario['type'] == 'issuer_degradation':
-                    if scenario['affected'] == issuer:
-                        success_prob *= (1 - scenario['severity'])
-                        base_latency += int(300 * scenario['severity'])
+        if self._min_start <= self.transaction_counter <= self._max_end:
+            for index in self._active_scenarios():
+                scenario = self.degradation_scenarios[index]
+                kind = scenario.type_code
+                if kind == ScenarioType.ISSUER_DEGRADATION:
+                    if scenario.affected == issuer:
+                        success_prob *= scenario.sev_complement
+                        base_latency += scenario.lat_issuer
                         
-                elif scenario['type'] == 'method_fatigue':
-                    if scenario['affected'] == payment_method:
-                        success_prob *= (1 - scenario['severity'])
+                elif kind == ScenarioType.METHOD_FATIGUE:
+                    if scenario.affected == payment_method:
+                        success_prob *= scenario.sev_complement
                         
-                elif scenario['type'] == 'retry_storm':
-                    if random.random() < scenario['severity']:
-                        retry_count = random.randint(1, 4)
+                elif kind == ScenarioType.RETRY_STORM:
+                    if rand() < scenario.severity:
+                        retry_count = randint(1, 4)
                         success_prob *= 0.7
                         
-                elif scenario['type'] == 'latency_spike':
-                    base_latency += int(1000 * scenario['severity'])
+                elif kind == ScenarioType.LATENCY_SPIKE:
+                    base_latency += scenario.lat_spike
                     
-                elif scenario['type'] == 'error_clustering':
-                    if random.random() < scenario['severity']:
-                        error_code = scenario['affected']
+                elif kind == ScenarioType.ERROR_CLUSTERING:
+                    if rand() < scenario.severity:
+                        error_code = scenario.affected
                         success_prob = 0.1
         
         # Determine outcome
-        if random.random() < success_prob:
-            status = PaymentStatus.SUCCESS
+        if rand() < success_prob:
+            status = _S
             error_code = None
         else:
-            status = PaymentStatus.FAILED
+            status = _F
             if not error_code:
-                error_code = random.choice(self.error_codes)
+                error_code = fallback_error
         
         # Add some variance
-        latency = base_latency + random.randint(-100, 100)
-        amount = round(random.uniform(10, 1000), 2)
+        latency = base_latency + variance
+        amount = _round(self._uniform(10, 1000), 2)
         
-        return PaymentSignal(
-            transaction_id=f"txn_{self.transaction_counter:06d}",
-            timestamp=datetime.now(),
+        return _signal(
+            transaction_id="txn_%06d" % self.transaction_counter,
+            timestamp=timestamp,
             status=status,
             payment_method=payment_method,
             issuer_bank=issuer,
             processor=processor,
             amount=amount,
-            currency=random.choice(self.currencies),
-            latency_ms=max(latency, 100),
+            currency=currency,
+            latency_ms=_max(latency, 100),
             error_code=error_code,
             retry_count=retry_count,
-            merchant_category=random.choice(self.merchant_categories),
-            risk_score=random.random()
+            merchant_category=merchant_category,
+            risk_score=rand()
         )
         
+    def _active_scenarios(self) -> List[int]:
+        """Indices of scenarios covering the current transaction counter
+        
+        Events are sorted once, then a pointer sweeps forward as the counter
+        grows, so each call only touches scenarios that start or end.
+        """
+        if not self._events_sorted:
+            self._events.sort()
+            self._events_sorted = True
+            self._event_ptr = 0
+            self._active = []
+        
+        events = self._events
+        while self._event_ptr < len(events) and events[self._event_ptr][0] <= self.transaction_counter:
+            _, delta, index = events[self._event_ptr]
+            if delta > 0:
+                bisect.insort(self._active, index)
+            else:
+                self._active.remove(index)
+            self._event_ptr += 1
+        return self._active
+        
     def generate_batch(self, count: int) -> List[PaymentSignal]:
         """Generate a batch of payment transactions"""
-        return [self.generate_payment() for _ in range(count)]
+        return self._signals_from_columns(self.generate_batch_columns(count))
+        
+    def generate_stream(self, count: int, chunk: int = 4096) -> Iterator[PaymentSignal]:
+        """Yield payment transactions, generated chunk rows at a time
+        
+        Keeps generate_batch's bulk draws while holding at most one chunk
+        of PaymentSignal objects; wrap in list() when a list is needed.
+        """
+        for start in range(0, count, chunk):
+            yield from self.generate_batch(min(chunk, count - start))
+        
+    def generate_batch_columns_parallel(self, count: int, workers: int) -> Dict[str, np.ndarray]:
+        """generate_batch_columns split across worker processes
+        
+        Each worker gets a contiguous slice of the counter range and its own
+        stream spawned from the simulator's seed sequence, so scenario
+        windows line up with the serial path. With fewer than two workers
+        it runs generate_batch_columns in-process.
+        
+        Opt-in only: a pool is started per call and every column is
+        pickled back to the parent, which measured slower than the serial
+        generate_batch_columns at every batch size tried (50k rows: 43 ms
+        vs 8 ms; 1M rows: 342 ms vs 84 ms with 4 workers). Use it only
+        where per-row generation is much more expensive than that.
+        """
+        if workers < 2:
+            return self.generate_batch_columns(count)
+        
+        # Encode scenarios once here instead of in every worker
+        self._encode_scenarios()
+        
+        sizes = [count // workers + (i < count % workers) for i in range(workers)]
+        starts = [self.transaction_counter + sum(sizes[:i]) for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(
+                _generate_columns_worker,
+                [self] * workers, starts, sizes, self._seed_seq.spawn(workers),
+            ))
+        
+        columns = {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+        
+        # Restamp in the parent so timestamps stay monotonic across workers
+        self.transaction_counter += count
+        now = self._now()
+        now_us = int(now.timestamp()) * 1_000_000 + now.microsecond
+        columns['timestamp_us'] = now_us + np.arange(count, dtype=np.int64)
+        return columns
+        
+    def generate_batch_columns(self, count: int) -> Dict[str, np.ndarray]:
+        """Generate a batch of payment transactions as columnar arrays
+        
+        Same model as generate_payment, but every random quantity is drawn
+        up front as one NumPy array per field and scenarios are applied to
+        the whole batch in a single pass. Categorical columns hold indices
+        into payment_methods, issuer_banks, processors, currencies and
+        merchant_categories; error_code_idx indexes error_vocabulary and
+        is -1 for successful transactions. Status holds PaymentStatus codes.
+        """
+        rng = self.rng
+        first = self.transaction_counter + 1
+        counters = np.arange(first, first + count)
+        
+        # Returned columns are freshly allocated
+        method_idx = rng.integers(0, len(self.payment_methods), size=count)
+        issuer_idx = rng.integers(0, len(self.issuer_banks), size=count)
+        processor_idx = rng.integers(0, len(self.processors), size=count)
+        currency_idx = rng.integers(0, len(self.currencies), size=count)
+        category_idx = rng.integers(0, len(self.merchant_categories), size=count)
+        amount = np.round(rng.uniform(10, 1000, size=count), 2)
+        risk = rng.random(count)
+        retry_count = np.zeros(count, dtype=np.int64)
+        
+        # Intermediates never leave this call, so they reuse scratch buffers
+        buf = self._scratch(count)
+        base_latency = self._integers_into(buf['base_latency'], 200, 801, buf['uniform'])
+        variance = self._integers_into(buf['variance'], -100, 101, buf['uniform'])
+        roll = rng.random(out=buf['roll'])
+        retry_roll = rng.random(out=buf['retry_roll'])
+        retry_draw = self._integers_into(buf['retry_draw'], 1, 5, buf['uniform'])
+        cluster_roll = rng.random(out=buf['cluster_roll'])
+        error_idx = self._integers_into(buf['error_idx'], 0, len(self.error_codes), buf['uniform'])
+        
+        success_prob = buf['success_prob']
+        success_prob.fill(0.85)
+        error_code = buf['error_code']  # index into error_vocabulary
+        error_code.fill(-1)
+        
+        # Apply degradation scenarios, in order, to every row they cover
+        _apply_scenarios(
+            counters, issuer_idx, method_idx, retry_roll, retry_draw, cluster_roll,
+            *self._encode_scenarios(),
+            success_prob, base_latency, retry_count, error_code,
+        )
+        
+        # Determine outcomes; failures without a clustered error get a random one
+        success = roll < success_prob
+        error_code = np.where(success, -1, np.where(error_code >= 0, error_code, error_idx)).astype(_ERROR_CODE_DTYPE)
+        
+        self.transaction_counter += count
+        # One clock read per batch; rows are stamped a microsecond apart
+        now = self._now()
+        now_us = int(now.timestamp()) * 1_000_000 + now.microsecond
+        
+        return {
+            'transaction_id': counters,
+            'timestamp_us': now_us + np.arange(count, dtype=np.int64),
+            'status': np.where(success, PaymentStatus.SUCCESS, PaymentStatus.FAILURE).astype(np.int8),
+            'payment_method_idx': method_idx,
+            'issuer_idx': issuer_idx,
+            'processor_idx': processor_idx,
+            'currency_idx': currency_idx,
+            'merchant_category_idx': category_idx,
+            'amount': amount,
+            'latency_ms': np.maximum(base_latency + variance, 100),
+            'retry_count': retry_count,
+            'error_code_idx': error_code,
+            'risk_score': risk,
+        }
+    
+    def _scratch(self, count: int) -> Dict[str, np.ndarray]:
+        """Scratch arrays for a batch of count rows, allocated once per count
+        
+        The cache is least-recently-used: a hit moves count to the back of
+        the dict, and the front entry is evicted when it is full.
+        """
+        buffers = self._buffers.pop(count, None)
+        if buffers is not None:
+            self._buffers[count] = buffers
+        else:
+            if len(self._buffers) >= _MAX_BUFFERED_COUNTS:
+                self._buffers.pop(next(iter(self._buffers)))
+            buffers = self._buffers[count] = {
+                'uniform': np.empty(count),
+                'base_latency': np.empty(count, dtype=np.int64),
+                'variance': np.empty(count, dtype=np.int64),
+                'roll': np.empty(count),
+                'retry_roll': np.empty(count),
+                'retry_draw': np.empty(count, dtype=np.int64),
+                'cluster_roll': np.empty(count),
+                'error_idx': np.empty(count, dtype=_ERROR_CODE_DTYPE),
+                'success_prob': np.empty(count),
+                'error_code': np.empty(count, dtype=_ERROR_CODE_DTYPE),
+            }
+        return buffers
+    
+    def _integers_into(self, out: np.ndarray, low: int, high: int, uniform: np.ndarray) -> np.ndarray:
+        """Fill out with integers in [low, high), like rng.integers
+        
+        Generator.integers has no out= argument, so scale a uniform draw
+        into the float scratch array and truncate it into out.
+        """
+        self.rng.random(out=uniform)
+        uniform *= high - low
+        out[...] = uniform  # truncates; the scaled draws are non-negative
+        out += low
+        return out
+    
+    def _signals_from_columns(self, columns: Dict[str, np.ndarray]) -> List[PaymentSignal]:
+        """Materialize PaymentSignal objects from generate_batch_columns output"""
+        timestamps = columns['timestamp_us']
+        if len(timestamps):
+            first_us = int(timestamps[0])
+            base = datetime.fromtimestamp(first_us // 1_000_000).replace(microsecond=first_us % 1_000_000)
+            offsets = (timestamps - first_us).tolist()
+        else:
+            base, offsets = None, []
+        
+        errors = (None,) + tuple(self.error_vocabulary)  # shifted so -1 maps to None
+        
+        return [
+            PaymentSignal(
+                transaction_id="txn_%06d" % txn,
+                timestamp=base + timedelta(microseconds=offset),
+                status=PaymentStatus(status),
+                payment_method=self.payment_methods[method],
+                issuer_bank=self.issuer_banks[issuer],
+                processor=self.processors[processor],
+                amount=amount,
+                currency=self.currencies[currency],
+                latency_ms=latency,
+                error_code=errors[error + 1],
+                retry_count=retry_count,
+                merchant_category=self.merchant_categories[category],
+                risk_score=risk
+            )
+            for txn, offset, status, method, issuer, processor, currency, category,
+                amount, latency, retry_count, error, risk in zip(
+                columns['transaction_id'].tolist(),
+                offsets,
+                columns['status'].tolist(),
+                columns['payment_method_idx'].tolist(),
+                columns['issuer_idx'].tolist(),
+                columns['processor_idx'].tolist(),
+                columns['currency_idx'].tolist(),
+                columns['merchant_category_idx'].tolist(),
+                columns['amount'].tolist(),
+                columns['latency_ms'].tolist(),
+                columns['retry_count'].tolist(),
+                columns['error_code_idx'].tolist(),
+                columns['risk_score'].tolist(),
+            )
+        ]
+    
+    def _encode_scenarios(self):
+        """Scenarios as parallel arrays, in the order the scenario kernels take
+        
+        Type, affected code, start, end and severity, then the derived
+        severity complement, issuer latency penalty and latency spike.
+        Arrays are cached until the next add_degradation_scenario call.
+        """
+        if self._scenario_columns is None:
+            scenarios = self.degradation_scenarios
+            self._scenario_columns = (
+                np.array([sc.type_code for sc in scenarios], dtype=np.int64),
+                np.array([sc.affected_code for sc in scenarios], dtype=np.int64),
+                np.array([sc.start for sc in scenarios], dtype=np.int64),
+                np.array([sc.end for sc in scenarios], dtype=np.int64),
+                np.array([sc.severity for sc in scenarios], dtype=np.float64),
+                np.array([sc.sev_complement for sc in scenarios], dtype=np.float64),
+                np.array([sc.lat_issuer for sc in scenarios], dtype=np.int64),
+                np.array([sc.lat_spike for sc in scenarios], dtype=np.int64),
+            )
+        return self._scenario_columns
+    
+    def _code_for(self, type_code: int, affected: str) -> int:
+        """Issuer, payment method or error index a scenario targets, or -1"""
+        if type_code == ScenarioType.ISSUER_DEGRADATION:
+            return self.issuer_banks.index(affected) if affected in self.issuer_banks else -1
+        if type_code == ScenarioType.METHOD_FATIGUE:
+            return self.payment_methods.index(affected) if affected in self.payment_methods else -1
+        if type_code == ScenarioType.ERROR_CLUSTERING:
+            return self._error_index(affected)
+        return -1
+    
+    def _error_index(self, error_code: str) -> int:
+        """Integer code for an error name, registering unseen names"""
+        if error_code not in self.error_vocabulary:
+            if len(self.error_vocabulary) > np.iinfo(_ERROR_CODE_DTYPE).max:
+                raise ValueError(
+                    f"Too many distinct error codes to encode ({len(self.error_vocabulary)})"
+                )
+            self.error_vocabulary.append(error_code)
+        return self.error_vocabulary.index(error_code)
         
     def setup_realistic_scenarios(self):
         """Setup realistic degradation scenarios for demonstration"""
@@ -169,41 +677,41 @@ class ScenarioDescriptor:
         print("="*80)
         
         for i, scenario in enumerate(simulator.degradation_scenarios, 1):
-            print(f"\nScenario {i}: {scenario['type'].upper()}")
-            print(f"  Affected: {scenario['affected']}")
-            print(f"  Start: Transaction #{scenario['start']}")
-            print(f"  Duration: {scenario['end'] - scenario['start']} transactions")
-            print(f"  Severity: {scenario['severity']:.0%}")
+            print(f"\nScenario {i}: {scenario.type.upper()}")
+            print(f"  Affected: {scenario.affected}")
+            print(f"  Start: Transaction #{scenario.start}")
+            print(f"  Duration: {scenario.end - scenario.start} transactions")
+            print(f"  Severity: {scenario.severity:.0%}")
             
             # Explain expected agent response
-            if scenario['type'] == 'issuer_degradation':
+            if scenario.type_code == ScenarioType.ISSUER_DEGRADATION:
                 print(f"  📊 Expected Agent Response:")
                 print(f"     - Detect issuer degradation pattern")
                 print(f"     - Suppress failing path or optimize routing")
-                print(f"     - Should improve success rate by routing around {scenario['affected']}")
+                print(f"     - Should improve success rate by routing around {scenario.affected}")
                 
-            elif scenario['type'] == 'retry_storm':
+            elif scenario.type_code == ScenarioType.RETRY_STORM:
                 print(f"  📊 Expected Agent Response:")
                 print(f"     - Detect retry storm pattern")
                 print(f"     - Adjust retry delays and limits")
                 print(f"     - Should reduce retry rate and system load")
                 
-            elif scenario['type'] == 'method_fatigue':
+            elif scenario.type_code == ScenarioType.METHOD_FATIGUE:
                 print(f"  📊 Expected Agent Response:")
                 print(f"     - Detect method fatigue pattern")
                 print(f"     - Alert ops team or suppress if severe")
-                print(f"     - Monitor {scenario['affected']} closely")
+                print(f"     - Monitor {scenario.affected} closely")
                 
-            elif scenario['type'] == 'latency_spike':
+            elif scenario.type_code == ScenarioType.LATENCY_SPIKE:
                 print(f"  📊 Expected Agent Response:")
                 print(f"     - Detect latency spike")
                 print(f"     - Alert ops team for investigation")
                 print(f"     - May optimize routing to faster processors")
                 
-            elif scenario['type'] == 'error_clustering':
+            elif scenario.type_code == ScenarioType.ERROR_CLUSTERING:
                 print(f"  📊 Expected Agent Response:")
                 print(f"     - Detect error code clustering")
                 print(f"     - Alert ops team with error details")
-                print(f"     - Investigate {scenario['affected']}")
+                print(f"     - Investigate {scenario.affected}")
         
         print("\n" + "="*80 + "\n")